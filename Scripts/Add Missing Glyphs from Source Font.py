@@ -13,6 +13,9 @@ Usage:
 """
 
 import os
+import plistlib
+import re
+from concurrent.futures import ThreadPoolExecutor
 from AppKit import NSOpenPanel, NSFileHandlingPanelOKButton, NSAlert
 
 try:
@@ -29,95 +32,139 @@ except ImportError:
     DEFCON_AVAILABLE = False
     print("Warning: defcon not available. Install with: pip3 install defcon")
 
+# Log every added glyph up to LOG_FIRST, then only every LOG_EVERY-th one
+LOG_FIRST = 20
+LOG_EVERY = 100
 
-def get_glyph_list_from_glyphs_file(source_path):
-    """Get list of glyph names from a Glyphs file."""
-    source_font = GSFont(source_path)
-    return [glyph.name for glyph in source_font.glyphs]
+# Set GLYPHS_AUTOCONFIRM=1 to skip the confirmation alert (for scripted runs)
+AUTOCONFIRM = os.environ.get('GLYPHS_AUTOCONFIRM', '') not in ('', '0')
 
+# Pattern for reading unicodes from a .glif file without an XML parser
+# (XML allows either quote style around attribute values)
+UNICODE_HEX_RE = re.compile(rb'<unicode\b[^>]*\bhex\s*=\s*(["\'])([0-9A-Fa-f]+)\1')
 
-def get_glyph_list_from_ufo(source_path):
-    """Get list of glyph names from a UFO."""
-    if not DEFCON_AVAILABLE:
-        raise ImportError("defcon is required for UFO files. Install with: pip3 install defcon")
-    
-    font = defcon.Font(source_path)
-    return [glyph.name for glyph in font]
-
-
-def get_glyph_list_from_binary(source_path):
-    """Get list of glyph names from a compiled font (TTF/OTF)."""
-    if not FONTTOOLS_AVAILABLE:
-        raise ImportError("fontTools is required for TTF/OTF files. Install with: pip3 install fonttools")
-    
-    font = TTFont(source_path)
-    return font.getGlyphOrder()
+# Source font kind for each supported file extension
+FONT_KINDS = {
+    '.glyphs': 'glyphs',
+    '.glyphx': 'glyphs',
+    '.ufo': 'ufo',
+    '.ttf': 'binary',
+    '.otf': 'binary',
+}
 
 
-def get_glyph_data_from_glyphs_file(source_path, glyph_names):
-    """Get glyph data (including unicode, category, subcategory) from Glyphs file."""
+def get_glyphs_and_data_from_glyphs_file(source_path):
+    """Get glyph names and data (unicode, category, subcategory, script) from a Glyphs file."""
     source_font = GSFont(source_path)
     glyph_data = {}
     
-    for glyph_name in glyph_names:
-        source_glyph = source_font.glyphs[glyph_name]
-        if source_glyph:
-            glyph_data[glyph_name] = {
-                'unicode': source_glyph.unicode,
-                'category': source_glyph.category,
-                'subCategory': source_glyph.subCategory,
-                'script': source_glyph.script
-            }
+    for source_glyph in source_font.glyphs:
+        glyph_data[source_glyph.name] = {
+            'unicode': source_glyph.unicode,
+            'category': source_glyph.category,
+            'subCategory': source_glyph.subCategory,
+            'script': source_glyph.script
+        }
     
-    return glyph_data
+    return list(glyph_data), glyph_data
 
 
-def get_glyph_data_from_ufo(source_path, glyph_names):
-    """Get glyph data from UFO (limited info available)."""
-    if not DEFCON_AVAILABLE:
-        raise ImportError("defcon is required for UFO files")
-    
-    font = defcon.Font(source_path)
-    glyph_data = {}
-    
-    for glyph_name in glyph_names:
-        if glyph_name in font:
-            source_glyph = font[glyph_name]
-            # UFO has limited metadata
+def read_ufo_glyphs_fast(source_path):
+    """
+    Read glyph names and first unicodes from a UFO without building a
+    defcon font. Reads contents.plist and scans each .glif with a regular
+    expression instead of parsing the XML. Returns a list of (name, unicode)
+    tuples, or None if the UFO can't be read this way.
+    """
+    glyphs_dir = os.path.join(source_path, 'glyphs')
+    try:
+        with open(os.path.join(glyphs_dir, 'contents.plist'), 'rb') as f:
+            contents = plistlib.load(f)
+        
+        glyphs = []
+        for glyph_name, file_name in contents.items():
+            with open(os.path.join(glyphs_dir, file_name), 'rb') as f:
+                glif = f.read()
+            if b'<glyph' not in glif:
+                return None
+            
+            # A <unicode> the pattern can't read is left to the full parser
             unicode_val = None
-            if source_glyph.unicodes:
-                unicode_val = format(source_glyph.unicodes[0], '04X')
+            match = UNICODE_HEX_RE.search(glif)
+            if match:
+                unicode_val = int(match.group(2), 16)
+            elif b'<unicode' in glif:
+                return None
             
+            glyphs.append((glyph_name, unicode_val))
+        
+        return glyphs
+    except Exception:
+        return None
+
+
+def get_glyphs_and_data_from_ufo(source_path):
+    """Get glyph names and data from a UFO (limited info available)."""
+    glyph_names = []
+    glyph_data = {}
+    
+    fast_glyphs = read_ufo_glyphs_fast(source_path)
+    if fast_glyphs is not None:
+        for glyph_name, unicode_val in fast_glyphs:
+            glyph_names.append(glyph_name)
             glyph_data[glyph_name] = {
                 'unicode': unicode_val,
                 'category': None,
                 'subCategory': None,
                 'script': None
             }
+        return glyph_names, glyph_data
     
-    return glyph_data
+    if not DEFCON_AVAILABLE:
+        raise ImportError("defcon is required for UFO files. Install with: pip3 install defcon")
+    
+    font = defcon.Font(source_path)
+    
+    for source_glyph in font:
+        glyph_name = source_glyph.name
+        glyph_names.append(glyph_name)
+        
+        # UFO has limited metadata
+        unicode_val = None
+        if source_glyph.unicodes:
+            unicode_val = source_glyph.unicodes[0]
+        
+        glyph_data[glyph_name] = {
+            'unicode': unicode_val,
+            'category': None,
+            'subCategory': None,
+            'script': None
+        }
+    
+    return glyph_names, glyph_data
 
 
-def get_glyph_data_from_binary(source_path, glyph_names):
-    """Get glyph data from binary font (very limited info)."""
+def get_glyphs_and_data_from_binary(source_path):
+    """Get glyph names and data from a compiled font (TTF/OTF, very limited info)."""
     if not FONTTOOLS_AVAILABLE:
-        raise ImportError("fontTools is required for TTF/OTF files")
+        raise ImportError("fontTools is required for TTF/OTF files. Install with: pip3 install fonttools")
     
-    font = TTFont(source_path)
+    font = TTFont(source_path, lazy=True)
+    glyph_names = font.getGlyphOrder()
     glyph_data = {}
     
-    # Get unicode mappings from cmap
+    # Get unicode mappings from the preferred cmap subtable
     unicode_map = {}
     if 'cmap' in font:
-        for table in font['cmap'].tables:
-            if table.isUnicode():
-                unicode_map.update(table.cmap)
+        cmap = font['cmap']
+        # getBestCmap skips the (3, 0) Windows Symbol subtable, which is
+        # all that symbol-encoded fonts have
+        unicode_map = cmap.getBestCmap() or cmap.getBestCmap(cmapPreferences=((3, 0),)) or {}
     
     # Reverse the map to get unicode for each glyph
     glyph_to_unicode = {}
     for unicode_val, glyph_name in unicode_map.items():
-        if glyph_name not in glyph_to_unicode:
-            glyph_to_unicode[glyph_name] = format(unicode_val, '04X')
+        glyph_to_unicode.setdefault(glyph_name, unicode_val)
     
     for glyph_name in glyph_names:
         glyph_data[glyph_name] = {
@@ -127,26 +174,29 @@ def get_glyph_data_from_binary(source_path, glyph_names):
             'script': None
         }
     
-    return glyph_data
+    return glyph_names, glyph_data
+
+
+def font_kind(source_path):
+    """Return 'glyphs', 'ufo' or 'binary' for a source font path."""
+    ext = os.path.splitext(source_path)[1].lower()
+    kind = FONT_KINDS.get(ext)
+    if kind:
+        return kind
+    # Only hit the file system for extensionless paths (e.g. a UFO folder)
+    if os.path.isdir(source_path):
+        return 'ufo'
+    raise ValueError(f"Unsupported format: {ext}")
 
 
 def get_glyphs_and_data(source_path):
     """Get glyph names and metadata from various font formats."""
-    ext = os.path.splitext(source_path)[1].lower()
-    
-    if ext in ['.glyphs', '.glyphx']:
-        glyph_names = get_glyph_list_from_glyphs_file(source_path)
-        glyph_data = get_glyph_data_from_glyphs_file(source_path, glyph_names)
-    elif ext == '.ufo' or os.path.isdir(source_path):
-        glyph_names = get_glyph_list_from_ufo(source_path)
-        glyph_data = get_glyph_data_from_ufo(source_path, glyph_names)
-    elif ext in ['.ttf', '.otf']:
-        glyph_names = get_glyph_list_from_binary(source_path)
-        glyph_data = get_glyph_data_from_binary(source_path, glyph_names)
-    else:
-        raise ValueError(f"Unsupported format: {ext}")
-    
-    return glyph_names, glyph_data
+    readers = {
+        'glyphs': get_glyphs_and_data_from_glyphs_file,
+        'ufo': get_glyphs_and_data_from_ufo,
+        'binary': get_glyphs_and_data_from_binary,
+    }
+    return readers[font_kind(source_path)](source_path)
 
 
 def choose_source_file():
@@ -163,27 +213,37 @@ def choose_source_file():
     return None
 
 
-def add_glyph_to_font(font, glyph_name, glyph_info):
-    """Add a new glyph to the font with metadata."""
+def unicode_hex(unicode_val):
+    """Return a unicode value as the hex string Glyphs expects (e.g. '0041')."""
+    if isinstance(unicode_val, str):
+        return unicode_val
+    return format(unicode_val, '04X')
+
+
+def create_glyph(glyph_name, glyph_info):
+    """Create a new glyph with metadata, ready to be added to the font."""
+    unicode_val = glyph_info.get('unicode')
+    category = glyph_info.get('category')
+    sub_category = glyph_info.get('subCategory')
+    script = glyph_info.get('script')
+    
     new_glyph = GSGlyph(glyph_name)
     
     # Set unicode if available
-    if glyph_info.get('unicode'):
-        new_glyph.unicode = glyph_info['unicode']
+    if unicode_val is not None:
+        new_glyph.unicode = unicode_hex(unicode_val)
     
     # Set category if available
-    if glyph_info.get('category'):
-        new_glyph.category = glyph_info['category']
+    if category:
+        new_glyph.category = category
     
     # Set subcategory if available
-    if glyph_info.get('subCategory'):
-        new_glyph.subCategory = glyph_info['subCategory']
+    if sub_category:
+        new_glyph.subCategory = sub_category
     
     # Set script if available
-    if glyph_info.get('script'):
-        new_glyph.script = glyph_info['script']
-    
-    font.glyphs.append(new_glyph)
+    if script:
+        new_glyph.script = script
     
     return new_glyph
 
@@ -198,12 +258,6 @@ def main():
     
     print(f"\n=== Add Missing Glyphs from Source Font ===")
     
-    # Get current glyph set with case-insensitive mapping
-    current_glyphs = set([glyph.name for glyph in font.glyphs])
-    # Create a lowercase to actual name mapping
-    current_glyphs_lower_map = {name.lower(): name for name in current_glyphs}
-    print(f"Current font has {len(current_glyphs)} glyphs")
-    
     # Choose source file
     source_path = choose_source_file()
     
@@ -214,101 +268,147 @@ def main():
     print(f"\nReading glyph list from: {os.path.basename(source_path)}")
     
     try:
-        # Get source glyphs and their data
-        source_glyphs, glyph_data = get_glyphs_and_data(source_path)
+        # UFO and binary sources are parsed on a worker thread while the
+        # current font is scanned here. GSFont objects stay on the main thread,
+        # so .glyphs sources are read inline.
+        is_glyphs_source = font_kind(source_path) == 'glyphs'
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            source_future = None
+            if not is_glyphs_source:
+                source_future = executor.submit(get_glyphs_and_data, source_path)
+            
+            # Get current glyph set with case-insensitive mapping
+            current_glyphs = {glyph.name for glyph in font.glyphs}
+            # Create a lowercase to actual name mapping
+            current_glyphs_lower_map = {name.lower(): name for name in current_glyphs}
+            print(f"Current font has {len(current_glyphs)} glyphs")
+            
+            # Get source glyphs and their data
+            if source_future is not None:
+                source_glyphs, glyph_data = source_future.result()
+            else:
+                source_glyphs, glyph_data = get_glyphs_and_data(source_path)
+        
         source_glyph_set = set(source_glyphs)
         print(f"Source font has {len(source_glyph_set)} glyphs")
         
         # Find missing glyphs (case-insensitive check to avoid duplicates)
         missing_glyphs = []
+        # Only the first few conflicts are shown, so only those are kept
         skipped_case_conflicts = []
+        case_conflict_count = 0
         
         for glyph_name in source_glyphs:
             # Check if this glyph exists in any case variation
-            if glyph_name.lower() in current_glyphs_lower_map:
-                existing_name = current_glyphs_lower_map[glyph_name.lower()]
-                if existing_name != glyph_name:
-                    skipped_case_conflicts.append(f"{glyph_name} (exists as {existing_name})")
-            else:
+            existing_name = current_glyphs_lower_map.get(glyph_name.lower())
+            if existing_name is None:
                 missing_glyphs.append(glyph_name)
+            elif existing_name != glyph_name:
+                case_conflict_count += 1
+                if case_conflict_count <= 10:
+                    skipped_case_conflicts.append((glyph_name, existing_name))
         
-        if skipped_case_conflicts:
-            print(f"\nSkipping {len(skipped_case_conflicts)} glyphs due to case conflicts:")
-            for conflict in skipped_case_conflicts[:10]:
-                print(f"  {conflict}")
-            if len(skipped_case_conflicts) > 10:
-                print(f"  ...and {len(skipped_case_conflicts) - 10} more")
+        if case_conflict_count:
+            lines = [f"\nSkipping {case_conflict_count} glyphs due to case conflicts:"]
+            for glyph_name, existing_name in skipped_case_conflicts:
+                lines.append(f"  {glyph_name} (exists as {existing_name})")
+            if case_conflict_count > 10:
+                lines.append(f"  ...and {case_conflict_count - 10} more")
+            print("\n".join(lines))
         
         if not missing_glyphs:
             Message("No Missing Glyphs", "Your font already contains all glyphs from the source font.")
             print("\n✓ No missing glyphs - your font is complete!")
             return
         
-        print(f"\nFound {len(missing_glyphs)} missing glyphs")
-        
-        # Sort for consistent ordering
-        missing_glyphs_sorted = sorted(missing_glyphs)
-        
-        # Show preview
-        preview_count = 20
-        preview_list = missing_glyphs_sorted[:preview_count]
-        remaining = len(missing_glyphs_sorted) - preview_count
+        missing_count = len(missing_glyphs)
+        print(f"\nFound {missing_count} missing glyphs")
         
-        preview_text = ", ".join(preview_list)
-        if remaining > 0:
-            preview_text += f"\n...and {remaining} more"
+        # Sort case-insensitively for consistent, readable ordering
+        missing_glyphs_sorted = sorted(missing_glyphs, key=str.lower)
         
-        # Ask for confirmation
-        response = Glyphs.showMacroWindow()
-        
-        message = f"Add {len(missing_glyphs)} missing glyphs?\n\n{preview_text}"
-        result = NSAlert.alertWithMessageText_defaultButton_alternateButton_otherButton_informativeTextWithFormat_(
-            "Add Missing Glyphs",
-            "Add Glyphs",
-            "Cancel",
-            None,
-            message
-        ).runModal()
-        
-        if result != 1:  # 1 = default button (Add Glyphs)
-            print("Cancelled by user")
-            return
+        if AUTOCONFIRM:
+            print("Adding without confirmation (GLYPHS_AUTOCONFIRM is set)")
+        else:
+            # Ask for confirmation
+            response = Glyphs.showMacroWindow()
+            
+            # Show preview, built only when the alert is actually shown
+            preview_count = 20
+            preview_text = ", ".join(missing_glyphs_sorted[:preview_count])
+            if missing_count > preview_count:
+                preview_text += f"\n...and {missing_count - preview_count} more"
+            
+            message = f"Add {missing_count} missing glyphs?\n\n{preview_text}"
+            result = NSAlert.alertWithMessageText_defaultButton_alternateButton_otherButton_informativeTextWithFormat_(
+                "Add Missing Glyphs",
+                "Add Glyphs",
+                "Cancel",
+                None,
+                message
+            ).runModal()
+            
+            if result != 1:  # 1 = default button (Add Glyphs)
+                print("Cancelled by user")
+                return
         
-        # Add missing glyphs with error handling
+        # Build the new glyphs first so they can be added in one batch
         added_count = 0
         failed_glyphs = []
+        new_glyphs = []
         
         for glyph_name in missing_glyphs_sorted:
+            # Double-check the glyph doesn't exist before adding
+            if glyph_name in current_glyphs:
+                print(f"  Skipping {glyph_name} - already exists")
+                continue
+            
             try:
-                # Double-check the glyph doesn't exist before adding
-                if font.glyphs[glyph_name] is not None:
-                    print(f"  Skipping {glyph_name} - already exists")
-                    continue
-                
                 info = glyph_data.get(glyph_name, {})
-                add_glyph_to_font(font, glyph_name, info)
-                added_count += 1
-                
-                # Print details
-                details = []
-                if info.get('unicode'):
-                    details.append(f"U+{info['unicode']}")
-                if info.get('category'):
-                    details.append(info['category'])
-                
-                detail_str = f" ({', '.join(details)})" if details else ""
-                print(f"  Added: {glyph_name}{detail_str}")
-                
+                new_glyphs.append((create_glyph(glyph_name, info), info))
+                current_glyphs.add(glyph_name)
             except Exception as e:
                 failed_glyphs.append((glyph_name, str(e)))
                 print(f"  Failed to add {glyph_name}: {e}")
         
+        # Suspend UI updates and group all adds into a single undo step
+        font.disableUpdateInterface()
+        font.undoManager().beginUndoGrouping()
+        try:
+            for new_glyph, info in new_glyphs:
+                glyph_name = new_glyph.name
+                try:
+                    font.glyphs.append(new_glyph)
+                    added_count += 1
+                    
+                    # Only log the first few adds, then every LOG_EVERY-th one
+                    if added_count > LOG_FIRST and added_count % LOG_EVERY:
+                        continue
+                    
+                    # Print details
+                    details = []
+                    if info.get('unicode') is not None:
+                        details.append(f"U+{unicode_hex(info['unicode'])}")
+                    if info.get('category'):
+                        details.append(info['category'])
+                    
+                    detail_str = f" ({', '.join(details)})" if details else ""
+                    print(f"  Added: {glyph_name}{detail_str} [{added_count}]")
+                    
+                except Exception as e:
+                    failed_glyphs.append((glyph_name, str(e)))
+                    print(f"  Failed to add {glyph_name}: {e}")
+        finally:
+            font.undoManager().endUndoGrouping()
+            font.enableUpdateInterface()
+        
         if failed_glyphs:
-            print(f"\nFailed to add {len(failed_glyphs)} glyphs:")
+            lines = [f"\nFailed to add {len(failed_glyphs)} glyphs:"]
             for name, error in failed_glyphs[:5]:
-                print(f"  {name}: {error}")
+                lines.append(f"  {name}: {error}")
             if len(failed_glyphs) > 5:
-                print(f"  ...and {len(failed_glyphs) - 5} more")
+                lines.append(f"  ...and {len(failed_glyphs) - 5} more")
+            print("\n".join(lines))
         
         # Show success message
         success_msg = f"✓ Successfully added {added_count} glyphs to your font"
@@ -13,6 +13,21 @@ Usage:
 3. All glyphs will be automatically colored based on their content
 """
 
+# Set to True to print the color chosen for every glyph
+VERBOSE = False
+
+# Define color indices (0-11 are the predefined Glyphs colors)
+GREEN = 5      # Dark green for paths only
+YELLOW = 3     # Yellow for both paths and components
+
+# Color and log label for each content type
+COLOR_MAP = {
+    'paths_only': (GREEN, "GREEN (paths only)"),
+    'both': (YELLOW, "YELLOW (paths + components)"),
+    'components_only': (None, "No color (components only)"),
+    'empty': (None, "No color (empty)"),
+}
+
 def analyze_glyph_content(glyph):
     """
     Analyze a glyph's content across all layers.
@@ -21,25 +36,28 @@ def analyze_glyph_content(glyph):
     has_paths = False
     has_components = False
     
-    # Check all layers in the glyph
+    # Check all layers in the glyph, walking each layer's shapes once
     for layer in glyph.layers:
-        if len(layer.paths) > 0:
-            has_paths = True
-        if len(layer.components) > 0:
-            has_components = True
+        shapes = layer.shapes
+        if not shapes:
+            continue
         
-        # Early exit if we've found both
-        if has_paths and has_components:
-            return 'both'
+        for shape in shapes:
+            if isinstance(shape, GSPath):
+                has_paths = True
+            elif isinstance(shape, GSComponent):
+                has_components = True
+            
+            # Early exit if we've found both
+            if has_paths and has_components:
+                return 'both'
     
-    if has_paths and not has_components:
+    if has_paths:
         return 'paths_only'
-    elif has_components and not has_paths:
+    elif has_components:
         return 'components_only'
-    elif not has_paths and not has_components:
-        return 'empty'
     else:
-        return 'both'
+        return 'empty'
 
 def color_glyphs():
     """Main function to color glyphs based on their content."""
@@ -54,41 +72,32 @@ def color_glyphs():
     print("COLOR GLYPHS BY CONTENT TYPE")
     print("="*60)
     
-    # Define color indices (0-11 are the predefined Glyphs colors)
-    GREEN = 5      # Dark green for paths only
-    YELLOW = 3     # Yellow for both paths and components
-    
     # Counters
-    paths_only_count = 0
-    both_count = 0
-    components_only_count = 0
-    empty_count = 0
+    counts = dict.fromkeys(COLOR_MAP, 0)
     
-    # Process all glyphs
-    for glyph in font.glyphs:
-        content_type = analyze_glyph_content(glyph)
-        
-        if content_type == 'paths_only':
-            glyph.color = GREEN
-            paths_only_count += 1
-            print(f"  {glyph.name}: GREEN (paths only)")
-        
-        elif content_type == 'both':
-            glyph.color = YELLOW
-            both_count += 1
-            print(f"  {glyph.name}: YELLOW (paths + components)")
-        
-        elif content_type == 'components_only':
-            # Remove color (set to None)
-            glyph.color = None
-            components_only_count += 1
-            print(f"  {glyph.name}: No color (components only)")
-        
-        elif content_type == 'empty':
-            # Remove color
-            glyph.color = None
-            empty_count += 1
-            print(f"  {glyph.name}: No color (empty)")
+    # Process all glyphs with UI updates suspended, as a single undo step
+    font.disableUpdateInterface()
+    font.undoManager().beginUndoGrouping()
+    try:
+        for glyph in font.glyphs:
+            content_type = analyze_glyph_content(glyph)
+            color, label = COLOR_MAP[content_type]
+            
+            # Skip writes that wouldn't change anything
+            if glyph.color != color:
+                glyph.color = color
+            counts[content_type] += 1
+            
+            if VERBOSE:
+                print(f"  {glyph.name}: {label}")
+    finally:
+        font.undoManager().endUndoGrouping()
+        font.enableUpdateInterface()
+    
+    paths_only_count = counts['paths_only']
+    both_count = counts['both']
+    components_only_count = counts['components_only']
+    empty_count = counts['empty']
     
     # Show summary
     print(f"\n{'='*60}")
@@ -139,47 +139,59 @@ class NumberVariantGenerator:
         base_numbers = ['zero', 'one', 'two', 'three', 'four', 
                        'five', 'six', 'seven', 'eight', 'nine']
         
-        for base_name in base_numbers:
-            base_glyph = self.font.glyphs[base_name]
-            
-            if not base_glyph:
-                print(f"Warning: Base glyph '{base_name}' not found. Skipping.")
-                continue
-            
-            for suffix in suffixes:
-                new_name = f"{base_name}.{suffix}"
+        # Master ids are the same for every base glyph
+        master_ids = [master.id for master in self.font.masters]
+        
+        # Suspend UI updates and group all edits into a single undo step
+        self.font.disableUpdateInterface()
+        self.font.undoManager().beginUndoGrouping()
+        try:
+            for base_name in base_numbers:
+                base_glyph = self.font.glyphs[base_name]
                 
-                # Check if glyph already exists
-                if self.font.glyphs[new_name]:
-                    if overwrite:
-                        del self.font.glyphs[new_name]
-                    else:
-                        print(f"Skipped: {new_name} (already exists)")
-                        skipped_count += 1
-                        continue
+                if not base_glyph:
+                    print(f"Warning: Base glyph '{base_name}' not found. Skipping.")
+                    continue
                 
-                # Create new glyph
-                new_glyph = GSGlyph(new_name)
-                self.font.glyphs.append(new_glyph)
+                # Read the base widths once per base glyph, not once per variant
+                master_widths = [(master_id, base_glyph.layers[master_id].width) for master_id in master_ids]
                 
-                # Copy layers
-                for master in self.font.masters:
-                    base_layer = base_glyph.layers[master.id]
-                    new_layer = new_glyph.layers[master.id]
+                for suffix in suffixes:
+                    new_name = f"{base_name}.{suffix}"
                     
-                    # Create component reference
-                    component = GSComponent(base_name)
-                    new_layer.components.append(component)
+                    # Check if glyph already exists
+                    if self.font.glyphs[new_name]:
+                        if overwrite:
+                            del self.font.glyphs[new_name]
+                        else:
+                            print(f"Skipped: {new_name} (already exists)")
+                            skipped_count += 1
+                            continue
                     
-                    # Copy width
-                    new_layer.width = base_layer.width
-                
-                # Copy Unicode and category info if appropriate
-                new_glyph.category = base_glyph.category
-                new_glyph.subCategory = base_glyph.subCategory
-                
-                created_count += 1
-                print(f"Created: {new_name}")
+                    # Create new glyph
+                    new_glyph = GSGlyph(new_name)
+                    self.font.glyphs.append(new_glyph)
+                    
+                    # Copy layers
+                    for master_id, width in master_widths:
+                        new_layer = new_glyph.layers[master_id]
+                        
+                        # Create component reference
+                        component = GSComponent(base_name)
+                        new_layer.components.append(component)
+                        
+                        # Copy width
+                        new_layer.width = width
+                    
+                    # Copy Unicode and category info if appropriate
+                    new_glyph.category = base_glyph.category
+                    new_glyph.subCategory = base_glyph.subCategory
+                    
+                    created_count += 1
+                    print(f"Created: {new_name}")
+        finally:
+            self.font.undoManager().endUndoGrouping()
+            self.font.enableUpdateInterface()
         
         # Show completion message
         message = f"Created {created_count} glyph(s)."
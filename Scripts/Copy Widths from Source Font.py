@@ -12,8 +12,12 @@ Usage:
 4. Widths will be copied to selected glyphs
 """
 
+import heapq
 import os
+import plistlib
+import re
 import sys
+from itertools import islice
 from AppKit import NSOpenPanel, NSFileHandlingPanelOKButton
 
 # Check Python libraries
@@ -29,6 +33,21 @@ try:
 except ImportError:
     DEFCON_AVAILABLE = False
 
+# Patterns for reading the header of a .glif file without an XML parser
+# (XML allows either quote style around attribute values)
+ADVANCE_WIDTH_RE = re.compile(rb'<advance\b[^>]*\bwidth\s*=\s*(["\'])([-+0-9.eE]+)\1')
+UNICODE_HEX_RE = re.compile(rb'<unicode\b[^>]*\bhex\s*=\s*(["\'])([0-9A-Fa-f]+)\1')
+ADVANCE_HAS_WIDTH_RE = re.compile(rb'<advance\b[^>]*\bwidth\s*=')
+
+# Source font kind for each supported file extension
+FONT_KINDS = {
+    '.glyphs': 'glyphs',
+    '.glyphx': 'glyphs',
+    '.ufo': 'ufo',
+    '.ttf': 'binary',
+    '.otf': 'binary',
+}
+
 
 def read_widths_from_glyphs_file(source_path):
     """Read glyph widths from another Glyphs file."""
@@ -41,26 +60,77 @@ def read_widths_from_glyphs_file(source_path):
         if not source_font.masters:
             raise ValueError("Source font has no masters")
         
-        master = source_font.masters[0]
+        master_id = source_font.masters[0].id
         
         for glyph in source_font.glyphs:
-            try:
-                layer = glyph.layers[master.id]
-                if layer:
-                    widths[glyph.name] = layer.width
-                    # Also store by unicode for cross-referencing
-                    if glyph.unicode:
-                        unicode_to_width[glyph.unicode] = layer.width
-            except:
-                continue
+            layer = glyph.layers[master_id]
+            if layer:
+                width = layer.width
+                widths[glyph.name] = width
+                # Also store by unicode for cross-referencing
+                if glyph.unicode:
+                    unicode_to_width[glyph.unicode] = width
         
         return widths, unicode_to_width
     except Exception as e:
         raise ValueError(f"Failed to read Glyphs file: {e}")
 
 
+def read_ufo_glyphs_fast(source_path):
+    """
+    Read glyph names, advance widths and first unicodes from a UFO without
+    building a defcon font. Reads contents.plist and scans each .glif with
+    regular expressions instead of parsing the XML. Returns a list of
+    (name, width, unicode) tuples, or None if the UFO can't be read this way.
+    """
+    glyphs_dir = os.path.join(source_path, 'glyphs')
+    try:
+        with open(os.path.join(glyphs_dir, 'contents.plist'), 'rb') as f:
+            contents = plistlib.load(f)
+        
+        glyphs = []
+        for glyph_name, file_name in contents.items():
+            with open(os.path.join(glyphs_dir, file_name), 'rb') as f:
+                glif = f.read()
+            if b'<glyph' not in glif:
+                return None
+            
+            # A missing width means 0, but a width or <unicode> the
+            # patterns can't read is left to the full parser
+            width = 0
+            match = ADVANCE_WIDTH_RE.search(glif)
+            if match:
+                value = match.group(2).decode('ascii')
+                width = float(value) if '.' in value or 'e' in value.lower() else int(value)
+            elif ADVANCE_HAS_WIDTH_RE.search(glif):
+                return None
+            
+            unicode_val = None
+            match = UNICODE_HEX_RE.search(glif)
+            if match:
+                unicode_val = int(match.group(2), 16)
+            elif b'<unicode' in glif:
+                return None
+            
+            glyphs.append((glyph_name, width, unicode_val))
+        
+        return glyphs
+    except Exception:
+        return None
+
+
 def read_widths_from_ufo(source_path):
     """Read glyph widths from a UFO source."""
+    fast_glyphs = read_ufo_glyphs_fast(source_path)
+    if fast_glyphs is not None:
+        widths = {}
+        unicode_to_width = {}
+        for glyph_name, width, unicode_val in fast_glyphs:
+            widths[glyph_name] = width
+            if unicode_val is not None:
+                unicode_to_width[format(unicode_val, '04X')] = width
+        return widths, unicode_to_width
+    
     if not DEFCON_AVAILABLE:
         raise ImportError("defcon library is required for UFO files.\nInstall with: pip3 install defcon")
     
@@ -87,54 +157,58 @@ def read_widths_from_binary(source_path):
         raise ImportError("fontTools library is required for TTF/OTF files.\nInstall with: pip3 install fonttools")
     
     try:
-        font = TTFont(source_path)
-        widths = {}
-        unicode_to_width = {}
+        font = TTFont(source_path, lazy=True)
         
         if 'hmtx' not in font:
             raise ValueError("Font has no horizontal metrics table")
         
-        hmtx = font['hmtx']
+        # hmtx.metrics is already a {name: (width, lsb)} dict
+        widths = {glyph_name: width for glyph_name, (width, lsb) in font['hmtx'].metrics.items()}
         
-        # Get unicode mappings from cmap
+        # Get unicode mappings from the preferred cmap subtable
         unicode_map = {}
         if 'cmap' in font:
-            for table in font['cmap'].tables:
-                if table.isUnicode():
-                    unicode_map.update(table.cmap)
-        
-        for glyph_name in font.getGlyphOrder():
-            try:
-                width, lsb = hmtx[glyph_name]
-                widths[glyph_name] = width
-            except:
-                continue
+            cmap = font['cmap']
+            # getBestCmap skips the (3, 0) Windows Symbol subtable, which is
+            # all that symbol-encoded fonts have
+            unicode_map = cmap.getBestCmap() or cmap.getBestCmap(cmapPreferences=((3, 0),)) or {}
         
         # Build unicode to width mapping
-        for unicode_val, glyph_name in unicode_map.items():
-            if glyph_name in widths:
-                unicode_to_width[format(unicode_val, '04X')] = widths[glyph_name]
+        to_hex = '{:04X}'.format
+        unicode_to_width = {
+            to_hex(unicode_val): widths[glyph_name]
+            for unicode_val, glyph_name in unicode_map.items()
+            if glyph_name in widths
+        }
         
         return widths, unicode_to_width
     except Exception as e:
         raise ValueError(f"Failed to read binary font: {e}")
 
 
+def font_kind(source_path):
+    """Return 'glyphs', 'ufo' or 'binary' for a source font path."""
+    ext = os.path.splitext(source_path)[1].lower()
+    kind = FONT_KINDS.get(ext)
+    if kind:
+        return kind
+    # Only hit the file system for extensionless paths (e.g. a UFO folder)
+    if os.path.isdir(source_path):
+        return 'ufo'
+    raise ValueError(f"Unsupported file format: {ext}\nSupported: .glyphs, .glyphx, .ufo, .ttf, .otf")
+
+
 def read_widths(source_path):
     """Read glyph widths from various font formats."""
     if not os.path.exists(source_path):
         raise ValueError(f"File not found: {source_path}")
     
-    ext = os.path.splitext(source_path)[1].lower()
-    
-    if ext in ['.glyphs', '.glyphx']:
-        return read_widths_from_glyphs_file(source_path)
-    elif ext == '.ufo' or os.path.isdir(source_path):
-        return read_widths_from_ufo(source_path)
-    elif ext in ['.ttf', '.otf']:
-        return read_widths_from_binary(source_path)
-    else:
-        raise ValueError(f"Unsupported file format: {ext}\nSupported: .glyphs, .glyphx, .ufo, .ttf, .otf")
+    readers = {
+        'glyphs': read_widths_from_glyphs_file,
+        'ufo': read_widths_from_ufo,
+        'binary': read_widths_from_binary,
+    }
+    return readers[font_kind(source_path)](source_path)
 
 
 def choose_source_file():
@@ -179,13 +253,13 @@ def main():
         print("ERROR: No glyphs selected")
         return
     
-    # Get unique glyph names from selection
-    selected_glyph_names = []
-    for layer in selected_layers:
-        if layer.parent and layer.parent.name:
-            selected_glyph_names.append(layer.parent.name)
-    
-    selected_glyph_names = list(set(selected_glyph_names))
+    # Map unique glyph names from selection to their glyphs, keeping
+    # selection order, so glyphs never have to be looked up by name
+    glyph_map = {
+        layer.parent.name: layer.parent for layer in selected_layers
+        if layer.parent and layer.parent.name
+    }
+    selected_glyph_names = list(glyph_map)
     
     if not selected_glyph_names:
         Message("No Valid Selection", "Please select valid glyphs.")
@@ -193,7 +267,7 @@ def main():
         return
     
     print(f"\nSelected {len(selected_glyph_names)} glyphs:")
-    print(f"  {', '.join(sorted(selected_glyph_names)[:10])}")
+    print(f"  {', '.join(heapq.nsmallest(10, selected_glyph_names))}")
     if len(selected_glyph_names) > 10:
         print(f"  ...and {len(selected_glyph_names) - 10} more")
     
@@ -221,37 +295,33 @@ def main():
         match_info = {}
         
         for name in selected_glyph_names:
-            matched = False
-            
             # Try direct name match first
             if name in source_widths:
                 widths_to_copy[name] = source_widths[name]
                 match_info[name] = "name"
-                matched = True
-            else:
-                # Try to match by unicode
-                target_glyph = font.glyphs[name]
-                if target_glyph and target_glyph.unicode:
-                    if target_glyph.unicode in unicode_to_width:
-                        widths_to_copy[name] = unicode_to_width[target_glyph.unicode]
-                        match_info[name] = f"unicode U+{target_glyph.unicode}"
-                        matched = True
+                continue
             
-            if not matched:
-                target_glyph = font.glyphs[name]
-                unicode_info = f" (U+{target_glyph.unicode})" if target_glyph and target_glyph.unicode else ""
-                print(f"  ✗ No match for: {name}{unicode_info}")
+            # Try to match by unicode
+            target_glyph = glyph_map[name]
+            target_unicode = target_glyph.unicode if target_glyph else None
+            if target_unicode and target_unicode in unicode_to_width:
+                widths_to_copy[name] = unicode_to_width[target_unicode]
+                match_info[name] = f"unicode U+{target_unicode}"
+                continue
+            
+            unicode_info = f" (U+{target_unicode})" if target_unicode else ""
+            print(f"  ✗ No match for: {name}{unicode_info}")
         
         if not widths_to_copy:
             msg = "None of the selected glyphs were found in the source font."
             Message("No Matches", msg)
             print(f"\nERROR: {msg}")
             print(f"\nSelected glyphs (first 5):")
-            for name in sorted(selected_glyph_names)[:5]:
-                target_glyph = font.glyphs[name]
+            for name in heapq.nsmallest(5, selected_glyph_names):
+                target_glyph = glyph_map[name]
                 unicode_info = f" U+{target_glyph.unicode}" if target_glyph and target_glyph.unicode else " (no unicode)"
                 print(f"  {name}{unicode_info}")
-            print(f"\nSource has (first 5): {', '.join(sorted(list(source_widths.keys())[:5]))}")
+            print(f"\nSource has (first 5): {', '.join(sorted(islice(source_widths, 5)))}")
             return
         
         print(f"\n✓ Matched {len(widths_to_copy)} glyphs:")
@@ -260,35 +330,47 @@ def main():
         print(f"  {match_by_name} by name, {match_by_unicode} by unicode")
         
         # Apply widths to all masters
-        print(f"\nApplying widths to {len(font.masters)} master(s)...")
-        updated_count = 0
+        masters = list(font.masters)
+        print(f"\nApplying widths to {len(masters)} master(s)...")
+        # Only the first 20 changes are listed, so only those are kept
         changes_made = []
+        changed_count = 0
+        
+        # Master layers share their master's id
+        master_ids = {master.id for master in masters}
         
-        for master in font.masters:
+        # Suspend UI updates and group all edits into a single undo step
+        font.disableUpdateInterface()
+        font.undoManager().beginUndoGrouping()
+        try:
             for glyph_name, width in widths_to_copy.items():
-                glyph = font.glyphs[glyph_name]
-                if glyph:
-                    layer = glyph.layers[master.id]
-                    if layer:
-                        old_width = layer.width
+                glyph = glyph_map[glyph_name]
+                for layer in glyph.layers:
+                    if layer.layerId not in master_ids:
+                        continue
+                    
+                    old_width = layer.width
+                    if old_width != width:
                         layer.width = width
-                        updated_count += 1
-                        
-                        if old_width != width:
+                        changed_count += 1
+                        if changed_count <= 20:
                             changes_made.append(f"{glyph_name}: {old_width} → {width}")
+        finally:
+            font.undoManager().endUndoGrouping()
+            font.enableUpdateInterface()
         
         # Report results
         missing = set(selected_glyph_names) - set(widths_to_copy.keys())
         
         print("\nChanges made:")
-        for change in changes_made[:20]:
+        for change in changes_made:
             print(f"  {change}")
-        if len(changes_made) > 20:
-            print(f"  ...and {len(changes_made) - 20} more changes")
+        if changed_count > 20:
+            print(f"  ...and {changed_count - 20} more changes")
         
-        success_msg = f"✓ Updated widths for {len(widths_to_copy)} glyphs across {len(font.masters)} master(s)"
+        success_msg = f"✓ Updated widths for {len(widths_to_copy)} glyphs across {len(masters)} master(s)"
         if missing:
-            success_msg += f"\n\n{len(missing)} glyphs not found in source:\n{', '.join(sorted(missing)[:10])}"
+            success_msg += f"\n\n{len(missing)} glyphs not found in source:\n{', '.join(heapq.nsmallest(10, missing))}"
             if len(missing) > 10:
                 success_msg += f"\n...and {len(missing) - 10} more"
         
@@ -296,7 +378,7 @@ def main():
         print(f"\n✓ Successfully updated {len(widths_to_copy)} glyphs")
         if missing:
             print(f"\nNot found in source ({len(missing)}):")
-            for name in sorted(missing)[:10]:
+            for name in heapq.nsmallest(10, missing):
                 print(f"  {name}")
             if len(missing) > 10:
                 print(f"  ...and {len(missing) - 10} more")
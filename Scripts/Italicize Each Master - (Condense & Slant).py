@@ -37,8 +37,11 @@ class TransformDialog:
         # Get selected glyphs
         self.selected_glyphs = self.get_selected_glyphs()
         
+        # Snapshot the masters once; used for layout and in transform()
+        self.masters = list(self.font.masters)
+        
         # Calculate window height based on number of masters
-        num_masters = len(self.font.masters)
+        num_masters = len(self.masters)
         base_height = 280
         per_master_height = 60
         window_height = base_height + (per_master_height * num_masters)
@@ -94,7 +97,7 @@ class TransformDialog:
         self.master_fields = []
         box_y = 10
         
-        for i, master in enumerate(self.font.masters):
+        for i, master in enumerate(self.masters):
             master_name = master.name if master.name else f"Master {i+1}"
             
             label = TextBox((10, box_y, 120, 20), master_name + ":", sizeStyle="small")
@@ -144,66 +147,69 @@ class TransformDialog:
             self.w.masterBox.show(True)
     
     def get_selected_glyphs(self):
-        """Get list of unique selected glyphs."""
-        glyphs = []
+        """Get list of unique selected glyphs, in selection order."""
+        # Unique glyphs, in selection order
+        glyphs = {}
         
-        if self.font.selectedLayers:
-            glyphs = list(set([layer.parent for layer in self.font.selectedLayers if layer.parent]))
+        for layer in self.font.selectedLayers or []:
+            glyph = layer.parent
+            if glyph and glyph.name not in glyphs:
+                glyphs[glyph.name] = glyph
         
-        return glyphs
+        return list(glyphs.values())
     
     def cancel(self, sender):
         self.w.close()
     
-    def transform_layer(self, layer, condense_percent, slant_degrees, sidebearing_percent):
-        """Apply transformation to a single layer."""
+    def build_transform_struct(self, condense_percent, slant_degrees):
+        """
+        Build the condense + slant transform struct once for a set of values.
+        Returns None for the identity transform.
+        """
+        # Apply horizontal scaling (condensing)
+        scale_factor = condense_percent / 100.0
+        if scale_factor == 1.0 and slant_degrees == 0:
+            return None
+        
+        # Slanting (shearing): convert degrees to radians and calculate skew
+        skew = math.tan(math.radians(slant_degrees)) if slant_degrees != 0 else 0.0
+        
+        # Scale-then-skew composes to a single matrix, so set it directly
+        # instead of building and appending a second transform
+        matrix = NSAffineTransform.alloc().init().transformStruct()
+        matrix.m11 = scale_factor  # x scale (condensing)
+        matrix.m12 = 0.0  # y shear
+        matrix.m21 = skew  # x shear (this creates the slant)
+        matrix.m22 = 1.0  # y scale
+        matrix.tX = 0.0
+        matrix.tY = 0.0
+        
+        return matrix
+    
+    def transform_layer(self, layer, transform_struct, sidebearing_percent):
+        """Apply a prebuilt transformation to a single layer."""
+        
+        # Nothing to do for 100% condense, 0° slant and 100% sidebearings;
+        # leave the layer untouched so it isn't dirtied or added to undo
+        if transform_struct is None and sidebearing_percent == 100.0:
+            return True
         
         try:
             # Store original sidebearings
             original_lsb = layer.LSB
             original_rsb = layer.RSB
             
-            # Create transformation matrix
-            transform = NSAffineTransform.alloc().init()
-            
-            # Apply horizontal scaling (condensing)
-            scale_factor = condense_percent / 100.0
-            transform.scaleXBy_yBy_(scale_factor, 1.0)
-            
-            # Apply slanting (shearing)
-            if slant_degrees != 0:
-                # Convert degrees to radians and calculate skew
-                slant_radians = math.radians(slant_degrees)
-                skew = math.tan(slant_radians)
-                
-                # Create a new transform for skewing
-                skew_transform = NSAffineTransform.alloc().init()
-                
-                # Set up the transformation matrix for skewing
-                matrix = skew_transform.transformStruct()
-                matrix.m11 = 1.0  # x scale
-                matrix.m12 = 0.0  # y shear
-                matrix.m21 = skew  # x shear (this creates the slant)
-                matrix.m22 = 1.0  # y scale
-                matrix.tX = 0.0
-                matrix.tY = 0.0
-                skew_transform.setTransformStruct_(matrix)
-                
-                # Combine transformations
-                transform.appendTransform_(skew_transform)
+            # Skip the shapes entirely for an identity matrix
+            if transform_struct is not None:
+                # Apply transformation to all paths and components in one
+                # pass over layer.shapes (layer.paths and layer.components
+                # each filter the shapes list again)
+                for shape in layer.shapes:
+                    shape.applyTransform(transform_struct)
             
-            # Get the transform structure once
-            transform_struct = transform.transformStruct()
-            
-            # Apply transformation to all paths
-            for path in layer.paths:
-                path.applyTransform(transform_struct)
-            
-            # Apply transformation to all components
-            for component in layer.components:
-                component.applyTransform(transform_struct)
-            
-            # Adjust sidebearings based on sidebearing_percent
+            # Adjust sidebearings based on sidebearing_percent. This is not a
+            # no-op at 100%: it restores the original sidebearings after the
+            # shapes were condensed/slanted (the identity case returned above)
             sidebearing_scale = sidebearing_percent / 100.0
             layer.LSB = original_lsb * sidebearing_scale
             layer.RSB = original_rsb * sidebearing_scale
@@ -246,12 +252,15 @@ class TransformDialog:
                 if sidebearing_percent < 0:
                     raise ValueError("Sidebearing percentage cannot be negative")
                 
-                # Apply same settings to all masters
-                for master in self.font.masters:
+                # Apply same settings to all masters, sharing one transform
+                transform_struct = self.build_transform_struct(condense_percent, slant_degrees)
+                for master in self.masters:
                     master_settings[master.id] = {
                         'condense': condense_percent,
                         'slant': slant_degrees,
-                        'sidebearing': sidebearing_percent
+                        'sidebearing': sidebearing_percent,
+                        'name': master.name,
+                        'transform': transform_struct
                     }
                 
                 print(f"\nMode: Same values for all masters")
@@ -277,7 +286,9 @@ class TransformDialog:
                     master_settings[master.id] = {
                         'condense': condense_percent,
                         'slant': slant_degrees,
-                        'sidebearing': sidebearing_percent
+                        'sidebearing': sidebearing_percent,
+                        'name': master.name,
+                        'transform': self.build_transform_struct(condense_percent, slant_degrees)
                     }
                     
                     print(f"\n{master.name}:")
@@ -295,25 +306,36 @@ class TransformDialog:
         total_layers = 0
         errors = 0
         
-        for glyph in self.selected_glyphs:
-            print(f"\n{glyph.name}:")
-            
-            for master in self.font.masters:
-                layer = glyph.layers[master.id]
-                if layer:
-                    settings = master_settings[master.id]
-                    success = self.transform_layer(
-                        layer, 
-                        settings['condense'], 
-                        settings['slant'],
-                        settings['sidebearing']
-                    )
+        # Unpack the per-master settings once into plain tuples
+        per_master = {
+            master_id: (settings['name'], settings['transform'], settings['sidebearing'])
+            for master_id, settings in master_settings.items()
+        }
+        
+        # Suspend UI updates and group all edits into a single undo step
+        self.font.disableUpdateInterface()
+        self.font.undoManager().beginUndoGrouping()
+        try:
+            for glyph in self.selected_glyphs:
+                print(f"\n{glyph.name}:")
+                
+                # Walk the glyph's layers once; master layers share their master's id
+                for layer in glyph.layers:
+                    master_settings_entry = per_master.get(layer.layerId)
+                    if master_settings_entry is None:
+                        continue
+                    
+                    master_name, transform_struct, sidebearing_percent = master_settings_entry
+                    success = self.transform_layer(layer, transform_struct, sidebearing_percent)
                     if success:
                         total_layers += 1
-                        print(f"  ✓ Transformed in {master.name}")
+                        print(f"  ✓ Transformed in {master_name}")
                     else:
                         errors += 1
-                        print(f"  ✗ Failed in {master.name}")
+                        print(f"  ✗ Failed in {master_name}")
+        finally:
+            self.font.undoManager().endUndoGrouping()
+            self.font.enableUpdateInterface()
         
         # Show results
         print(f"\n{'='*60}")
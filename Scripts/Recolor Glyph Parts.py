@@ -17,16 +17,28 @@ Usage:
 
 from vanilla import Window, TextBox, EditText, Button, CheckBox
 from AppKit import NSColor
+from functools import lru_cache
+
+# Set to True to print per-shape diagnostics while detecting the target color
+DEBUG = False
+
+
+# NSColors are immutable, so one shared instance per RGBA value is reused
+COLOR_POOL = {}
 
 
 def rgb_to_nscolor(r, g, b, a=1.0):
-    """Convert RGB values (0-255) to NSColor."""
-    return NSColor.colorWithCalibratedRed_green_blue_alpha_(
-        r / 255.0,
-        g / 255.0,
-        b / 255.0,
-        a
-    )
+    """Convert RGB values (0-255) to NSColor, reusing pooled instances."""
+    key = (r, g, b, a)
+    color = COLOR_POOL.get(key)
+    if color is None:
+        color = COLOR_POOL[key] = NSColor.colorWithCalibratedRed_green_blue_alpha_(
+            r / 255.0,
+            g / 255.0,
+            b / 255.0,
+            a
+        )
+    return color
 
 
 def nscolor_to_rgb(nscolor):
@@ -63,20 +75,35 @@ def get_fill_color(shape):
     return fill_color
 
 
-def colors_match_exact(color1_obj, color2_obj):
+@lru_cache(maxsize=256)
+def color_components(nscolor):
+    """
+    Return the (red, green, blue) float components of an NSColor.
+    Cached per color, so each distinct fill color is read over the bridge once.
+    """
+    return (nscolor.redComponent(), nscolor.greenComponent(), nscolor.blueComponent())
+
+
+def colors_match_exact(color_obj, target_color_obj, target_components):
     """
-    Compare two NSColor objects for exact match.
+    Compare an NSColor against the target color for exact match.
     """
-    if color1_obj is None or color2_obj is None:
+    if color_obj is None or target_components is None:
         return False
     
+    # Shapes often share the very same color object as the target
+    if color_obj is target_color_obj:
+        return True
+    
     try:
         # Get components directly - they're already in calibrated RGB
         tolerance = 0.002  # About 0.5 in 0-255 scale
+        red, green, blue = color_components(color_obj)
+        target_red, target_green, target_blue = target_components
         
-        return (abs(color1_obj.redComponent() - color2_obj.redComponent()) < tolerance and
-                abs(color1_obj.greenComponent() - color2_obj.greenComponent()) < tolerance and
-                abs(color1_obj.blueComponent() - color2_obj.blueComponent()) < tolerance)
+        return (abs(red - target_red) < tolerance and
+                abs(green - target_green) < tolerance and
+                abs(blue - target_blue) < tolerance)
     except Exception as e:
         print(f"Error comparing colors: {e}")
         return False
@@ -87,87 +114,101 @@ def get_color_from_shape(layer):
     Extract fillColor from the first colored path or component in a layer.
     Returns (NSColor object, description string) or (None, error message).
     """
-    print(f"\n{'='*60}")
-    print(f"Examining layer: {layer.name if hasattr(layer, 'name') else 'unnamed'}")
-    print(f"Paths: {len(layer.paths)}, Components: {len(layer.components)}")
+    if DEBUG:
+        print(f"\n{'='*60}")
+        print(f"Examining layer: {layer.name if hasattr(layer, 'name') else 'unnamed'}")
+        print(f"Paths: {len(layer.paths)}, Components: {len(layer.components)}")
     
     # Check paths
     for i, path in enumerate(layer.paths):
-        print(f"\n  Path {i}:")
+        if DEBUG:
+            print(f"\n  Path {i}:")
         
-        if hasattr(path, 'attributes') and path.attributes:
-            fill_color = path.attributes.get('fillColor')
-            print(f"    fillColor: {fill_color}")
+        attributes = getattr(path, 'attributes', None)
+        if attributes:
+            fill_color = attributes.get('fillColor')
+            if DEBUG:
+                print(f"    fillColor: {fill_color}")
             
             if fill_color:
                 # fillColor is an NSColor object
                 rgb = nscolor_to_rgb(fill_color)
-                print(f"    RGB: {rgb}")
+                if DEBUG:
+                    print(f"    RGB: {rgb}")
                 
                 if rgb:
                     return (fill_color, f"Path {i}: RGB({rgb[0]}, {rgb[1]}, {rgb[2]})")
-        else:
+        elif DEBUG:
             print(f"    No attributes")
     
     # Check components
     for i, component in enumerate(layer.components):
-        print(f"\n  Component {i} ({component.componentName}):")
+        if DEBUG:
+            print(f"\n  Component {i} ({component.componentName}):")
         
-        if hasattr(component, 'attributes') and component.attributes:
-            fill_color = component.attributes.get('fillColor')
-            print(f"    fillColor: {fill_color}")
+        attributes = getattr(component, 'attributes', None)
+        if attributes:
+            fill_color = attributes.get('fillColor')
+            if DEBUG:
+                print(f"    fillColor: {fill_color}")
             
             if fill_color:
                 rgb = nscolor_to_rgb(fill_color)
-                print(f"    RGB: {rgb}")
+                if DEBUG:
+                    print(f"    RGB: {rgb}")
                 
                 if rgb:
                     return (fill_color, f"Component {i} ({component.componentName}): RGB({rgb[0]}, {rgb[1]}, {rgb[2]})")
-        else:
+        elif DEBUG:
             print(f"    No attributes")
     
-    print(f"\n{'='*60}\n")
+    if DEBUG:
+        print(f"\n{'='*60}\n")
     return (None, "No colored shapes found")
 
 
-def recolor_shape(shape, target_color_obj, new_color_obj):
-    """
-    Check if a shape matches target fillColor and recolor if it does.
-    Returns True if recolored, False otherwise.
-    """
-    if not hasattr(shape, 'attributes') or not shape.attributes:
-        return False
-    
-    current_color = shape.attributes.get('fillColor')
-    
-    if not current_color:
-        return False
-    
-    # Check if it matches target
-    if colors_match_exact(current_color, target_color_obj):
-        try:
-            shape.attributes['fillColor'] = new_color_obj
+def layer_has_color(layer, target_color_obj, target_components):
+    """Return True as soon as any shape in the layer uses the target color."""
+    for shape in layer.shapes:
+        attributes = getattr(shape, 'attributes', None)
+        if attributes and colors_match_exact(attributes.get('fillColor'), target_color_obj, target_components):
             return True
-        except Exception as e:
-            print(f"    Error setting fillColor: {e}")
-            return False
-    
     return False
 
 
-def recolor_layer(layer, target_color_obj, new_color_obj):
+def recolor_layer(layer, target_color_obj, target_components, new_color_obj):
     """Recolor all shapes in a layer that match the target color."""
-    changes = 0
+    # Single pass over paths and components: read each shape's attributes
+    # once and group the shapes by fill color object
+    shapes_by_color = {}
     
-    # Process paths
-    for path in layer.paths:
-        if recolor_shape(path, target_color_obj, new_color_obj):
-            changes += 1
+    for shape in layer.shapes:
+        attributes = getattr(shape, 'attributes', None)
+        if not attributes:
+            continue
+        
+        fill_color = attributes.get('fillColor')
+        if not fill_color:
+            continue
+        
+        group = shapes_by_color.get(id(fill_color))
+        if group is None:
+            group = shapes_by_color[id(fill_color)] = (fill_color, [])
+        group[1].append(attributes)
+    
+    # Check each distinct color once and recolor only matching groups
+    changes = 0
     
-    # Process components
-    for component in layer.components:
-        if recolor_shape(component, target_color_obj, new_color_obj):
-            changes += 1
+    for fill_color, matching_attributes in shapes_by_color.values():
+        if not colors_match_exact(fill_color, target_color_obj, target_components):
+            continue
+        
+        for attributes in matching_attributes:
+            try:
+                attributes['fillColor'] = new_color_obj
+                changes += 1
+            except Exception as e:
+                print(f"    Error setting fillColor: {e}")
     
     return changes
 
@@ -178,6 +219,8 @@ class RecolorDialog:
         self.font = Glyphs.font
         self.target_color_obj = target_color_obj
         self.target_rgb = nscolor_to_rgb(target_color_obj)
+        # Read the target's components once instead of once per comparison
+        self.target_components = color_components(target_color_obj)
         
         self.w = Window((420, 220), "Recolor Glyph Parts")
         
@@ -256,8 +299,13 @@ class RecolorDialog:
                 glyphs_to_process = list(self.font.glyphs)
                 print(f"\nProcessing all {len(glyphs_to_process)} glyphs in font")
             else:
-                selected_layers = self.font.selectedLayers
-                glyphs_to_process = list(set([layer.parent for layer in selected_layers if layer.parent]))
+                # Unique glyphs, in selection order
+                glyphs_by_name = {}
+                for layer in list(self.font.selectedLayers or []):
+                    glyph = layer.parent
+                    if glyph and glyph.name not in glyphs_by_name:
+                        glyphs_by_name[glyph.name] = glyph
+                glyphs_to_process = list(glyphs_by_name.values())
                 print(f"\nProcessing {len(glyphs_to_process)} selected glyphs")
             
             if not glyphs_to_process:
@@ -267,21 +315,42 @@ class RecolorDialog:
             # Process glyphs
             total_changes = 0
             glyphs_changed = 0
+            changed_lines = []
             
-            for glyph in glyphs_to_process:
-                glyph_changes = 0
-                
-                # Process all masters
-                for master in self.font.masters:
-                    layer = glyph.layers[master.id]
-                    if layer:
-                        changes = recolor_layer(layer, self.target_color_obj, new_color_obj)
-                        glyph_changes += changes
-                        total_changes += changes
-                
-                if glyph_changes > 0:
+            # Master layers share their master's id
+            master_ids = {master.id for master in self.font.masters}
+            
+            # First pass is read-only: find the master layers that actually
+            # use the target color, so only those are written to
+            candidates = [
+                (glyph, layer)
+                for glyph in glyphs_to_process
+                for layer in glyph.layers
+                if layer.layerId in master_ids
+                and layer_has_color(layer, self.target_color_obj, self.target_components)
+            ]
+            
+            glyph_changes = {}
+            
+            # Suspend UI updates and group all edits into a single undo step
+            self.font.disableUpdateInterface()
+            self.font.undoManager().beginUndoGrouping()
+            try:
+                for glyph, layer in candidates:
+                    changes = recolor_layer(layer, self.target_color_obj, self.target_components, new_color_obj)
+                    glyph_changes[glyph.name] = glyph_changes.get(glyph.name, 0) + changes
+                    total_changes += changes
+            finally:
+                self.font.undoManager().endUndoGrouping()
+                self.font.enableUpdateInterface()
+            
+            for glyph_name, changes in glyph_changes.items():
+                if changes > 0:
                     glyphs_changed += 1
-                    print(f"  {glyph.name}: {glyph_changes} shapes recolored")
+                    changed_lines.append(f"  {glyph_name}: {changes} shapes recolored")
+            
+            if changed_lines:
+                print("\n".join(changed_lines))
             
             # Show results
             print(f"\n{'='*60}")
@@ -315,7 +384,7 @@ def main():
         return
     
     # Check if a layer is selected
-    selected_layers = font.selectedLayers
+    selected_layers = list(font.selectedLayers or [])
     if not selected_layers:
         Message("No Selection", "Please select a shape with the target color.")
         return
@@ -11,9 +11,13 @@ Usage:
 3. Glyphs will be renamed to nice names or Unicode names
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 # AFII to Unicode mapping
 # Based on Adobe Glyph List and common AFII assignments
-AFII_TO_UNICODE = {
+# Read-only, since the memoized lookups below assume it never changes
+AFII_TO_UNICODE = MappingProxyType({
     # Cyrillic
     'afii10017': '0410',  # A
     'afii10018': '0411',  # BE
@@ -201,9 +205,13 @@ AFII_TO_UNICODE = {
     'afii61573': '061B',  # ARABIC SEMICOLON
     'afii61574': '061F',  # ARABIC QUESTION MARK
     'afii08941': '20A4',  # LIRA SIGN
-}
+})
+
+# Fallback uni names, built once for every mapped AFII name
+_UNI_NAMES = {afii_name: f"uni{unicode_value}" for afii_name, unicode_value in AFII_TO_UNICODE.items()}
 
 
+@lru_cache(maxsize=None)
 def get_nice_name_from_unicode(unicode_value):
     """
     Get nice name from Unicode value using Glyphs' built-in glyph info.
@@ -212,24 +220,22 @@ def get_nice_name_from_unicode(unicode_value):
     try:
         # Try to get the production name (nice name) from Glyphs
         glyph_info = Glyphs.glyphInfoForUnicode(unicode_value)
-        if glyph_info and glyph_info.name:
-            # Check if it's actually a nice name (not a uni name)
-            if not glyph_info.name.startswith('uni') and not glyph_info.name.startswith('u'):
-                return glyph_info.name
+        if glyph_info:
+            # Check if it's actually a nice name (not a uni/u name)
+            name = glyph_info.name
+            if name and name[:1] != 'u':
+                return name
     except:
         pass
     return None
 
 
+@lru_cache(maxsize=None)
 def get_new_name_for_afii(afii_name):
     """
     Get the new name for an AFII glyph.
     Returns (new_name, name_type) where name_type is 'nice', 'uni', or None
     """
-    # Check if it's an AFII name
-    if not afii_name.startswith('afii'):
-        return None, None
-    
     # Look up the Unicode value
     unicode_value = AFII_TO_UNICODE.get(afii_name)
     if not unicode_value:
@@ -241,26 +247,28 @@ def get_new_name_for_afii(afii_name):
         return nice_name, 'nice'
     
     # Fall back to uni name
-    uni_name = f"uni{unicode_value}"
-    return uni_name, 'uni'
+    return _UNI_NAMES[afii_name], 'uni'
 
 
-def rename_glyph(font, old_name, new_name):
+def rename_glyph(font, old_name, new_name, existing):
     """
     Rename a glyph in the font.
+    existing is the set of glyph names in the font and is kept up to date.
     Returns True if successful, False otherwise.
     """
-    glyph = font.glyphs[old_name]
-    if not glyph:
-        return False
-    
     # Check if new name already exists
-    if font.glyphs[new_name]:
+    if new_name in existing:
         print(f"  ⚠️  Cannot rename {old_name} to {new_name}: name already exists")
         return False
     
+    glyph = font.glyphs[old_name]
+    if not glyph:
+        return False
+    
     try:
         glyph.name = new_name
+        existing.discard(old_name)
+        existing.add(new_name)
         return True
     except Exception as e:
         print(f"  ⚠️  Failed to rename {old_name} to {new_name}: {e}")
@@ -276,13 +284,13 @@ def main():
         return
     
     # Check if glyphs are selected
-    selected_layers = font.selectedLayers
+    selected_layers = list(font.selectedLayers or [])
     if not selected_layers:
         Message("No Selection", "Please select glyphs first.")
         return
     
-    # Get unique glyph names from selection
-    selected_glyph_names = list(set([layer.parent.name for layer in selected_layers if layer.parent]))
+    # Get unique glyph names from selection, in selection order
+    selected_glyph_names = list(dict.fromkeys(layer.parent.name for layer in selected_layers if layer.parent))
     
     if not selected_glyph_names:
         Message("No Valid Selection", "Please select valid glyphs.")
@@ -294,7 +302,7 @@ def main():
     # Find AFII glyphs and determine new names
     afii_glyphs = []
     for glyph_name in selected_glyph_names:
-        if glyph_name.startswith('afii'):
+        if glyph_name in AFII_TO_UNICODE:
             new_name, name_type = get_new_name_for_afii(glyph_name)
             if new_name:
                 afii_glyphs.append((glyph_name, new_name, name_type))
@@ -338,14 +346,25 @@ def main():
     renamed_count = 0
     failed_count = 0
     
+    # Snapshot existing names once instead of probing font.glyphs per rename
+    existing = {glyph.name for glyph in font.glyphs}
+    
     print("\nRenaming glyphs:")
-    for old_name, new_name, name_type in afii_glyphs:
-        marker = "✨" if name_type == 'nice' else "→"
-        if rename_glyph(font, old_name, new_name):
-            print(f"  {marker} {old_name} → {new_name}")
-            renamed_count += 1
-        else:
-            failed_count += 1
+    
+    # Suspend UI updates and group all renames into a single undo step
+    font.disableUpdateInterface()
+    font.undoManager().beginUndoGrouping()
+    try:
+        for old_name, new_name, name_type in afii_glyphs:
+            marker = "✨" if name_type == 'nice' else "→"
+            if rename_glyph(font, old_name, new_name, existing):
+                print(f"  {marker} {old_name} → {new_name}")
+                renamed_count += 1
+            else:
+                failed_count += 1
+    finally:
+        font.undoManager().endUndoGrouping()
+        font.enableUpdateInterface()
     
     # Show results
     result_msg = f"✓ Renamed {renamed_count} glyphs"
@@ -15,6 +15,9 @@ Usage:
 
 from vanilla import Window, TextBox, Button, CheckBox, VerticalStackGroup
 
+# Set to True to print the old and new metrics for every layer
+VERBOSE = False
+
 
 class CopySidebearingsDialog:
     
@@ -59,17 +62,18 @@ class CopySidebearingsDialog:
         self.w.targetLabel = TextBox((10, y, -10, 20), "Copy sidebearings to:")
         y += 25
         
-        # Create checkboxes for each master (except source)
-        self.master_checkboxes = {}
+        # Create checkboxes for each master (except source), keeping the
+        # resolved master next to its checkbox
+        self.master_pairs = []
         
         for master in self.font.masters:
             if master.id != self.source_master.id:
                 cb = CheckBox((20, y, -10, 20), master.name, value=True)
-                self.master_checkboxes[master.id] = cb
+                self.master_pairs.append((master, cb))
                 setattr(self.w, f"master_{master.id}", cb)
                 y += 25
         
-        if not self.master_checkboxes:
+        if not self.master_pairs:
             self.w.noMastersLabel = TextBox((20, y, -10, 20), 
                 "No other masters available", 
                 sizeStyle="small")
@@ -95,14 +99,16 @@ class CopySidebearingsDialog:
         self.w.open()
     
     def get_selected_glyphs(self):
-        """Get list of unique selected glyphs."""
-        glyphs = []
+        """Get list of unique selected glyphs, in selection order."""
+        # Unique glyphs, in selection order
+        glyphs = {}
         
-        # Try to get from selected layers
-        if self.font.selectedLayers:
-            glyphs = list(set([layer.parent for layer in self.font.selectedLayers if layer.parent]))
+        for layer in list(self.font.selectedLayers or []):
+            glyph = layer.parent
+            if glyph and glyph.name not in glyphs:
+                glyphs[glyph.name] = glyph
         
-        return glyphs
+        return list(glyphs.values())
     
     def cancel(self, sender):
         self.w.close()
@@ -121,11 +127,7 @@ class CopySidebearingsDialog:
             return
         
         # Get target masters
-        target_masters = []
-        for master_id, checkbox in self.master_checkboxes.items():
-            if checkbox.get():
-                master = self.font.masters[master_id]
-                target_masters.append(master)
+        target_masters = [master for master, checkbox in self.master_pairs if checkbox.get()]
         
         if not target_masters:
             self.w.info.set("Error: Please select at least one target master")
@@ -148,54 +150,67 @@ class CopySidebearingsDialog:
         # Process glyphs
         total_changes = 0
         
-        for glyph in self.selected_glyphs:
-            print(f"\n{glyph.name}:")
-            
-            # Get source layer
-            source_layer = glyph.layers[self.source_master.id]
-            
-            if not source_layer:
-                print(f"  ⚠ No layer found in source master")
-                continue
-            
-            source_lsb = source_layer.LSB
-            source_rsb = source_layer.RSB
-            source_width = source_layer.width
-            
-            print(f"  Source: LSB={source_lsb}, RSB={source_rsb}, Width={source_width}")
-            
-            # Apply to target masters
-            for target_master in target_masters:
-                target_layer = glyph.layers[target_master.id]
+        # Resolve master ids and names once, outside the glyph loop
+        source_id = self.source_master.id
+        targets = [(master.id, master.name) for master in target_masters]
+        
+        # Suspend UI updates and group all edits into a single undo step
+        self.font.disableUpdateInterface()
+        self.font.undoManager().beginUndoGrouping()
+        try:
+            for glyph in self.selected_glyphs:
+                if VERBOSE:
+                    print(f"\n{glyph.name}:")
+                
+                # Get source layer
+                source_layer = glyph.layers[source_id]
                 
-                if not target_layer:
-                    print(f"  ⚠ No layer found in {target_master.name}")
+                if not source_layer:
+                    print(f"  ⚠ {glyph.name}: No layer found in source master")
                     continue
                 
-                changes_made = False
+                source_lsb = source_layer.LSB
+                source_rsb = source_layer.RSB
+                source_width = source_layer.width
                 
-                if copy_width:
-                    # Copy width directly
-                    old_width = target_layer.width
-                    target_layer.width = source_width
-                    print(f"  {target_master.name}: Width {old_width} → {source_width}")
-                    changes_made = True
-                else:
-                    # Copy sidebearings
-                    if copy_left:
-                        old_lsb = target_layer.LSB
-                        target_layer.LSB = source_lsb
-                        print(f"  {target_master.name}: LSB {old_lsb} → {source_lsb}")
-                        changes_made = True
+                if VERBOSE:
+                    print(f"  Source: LSB={source_lsb}, RSB={source_rsb}, Width={source_width}")
+                
+                # Apply to target masters
+                for target_id, target_name in targets:
+                    target_layer = glyph.layers[target_id]
                     
-                    if copy_right:
-                        old_rsb = target_layer.RSB
-                        target_layer.RSB = source_rsb
-                        print(f"  {target_master.name}: RSB {old_rsb} → {source_rsb}")
+                    if not target_layer:
+                        print(f"  ⚠ {glyph.name}: No layer found in {target_name}")
+                        continue
+                    
+                    changes_made = False
+                    
+                    if copy_width:
+                        # Copy width directly
+                        if VERBOSE:
+                            print(f"  {target_name}: Width {target_layer.width} → {source_width}")
+                        target_layer.width = source_width
                         changes_made = True
-                
-                if changes_made:
-                    total_changes += 1
+                    else:
+                        # Copy sidebearings
+                        if copy_left:
+                            if VERBOSE:
+                                print(f"  {target_name}: LSB {target_layer.LSB} → {source_lsb}")
+                            target_layer.LSB = source_lsb
+                            changes_made = True
+                        
+                        if copy_right:
+                            if VERBOSE:
+                                print(f"  {target_name}: RSB {target_layer.RSB} → {source_rsb}")
+                            target_layer.RSB = source_rsb
+                            changes_made = True
+                    
+                    if changes_made:
+                        total_changes += 1
+        finally:
+            self.font.undoManager().endUndoGrouping()
+            self.font.enableUpdateInterface()
         
         # Show results
         print(f"\n{'='*60}")